@@ -7,52 +7,270 @@ import os
 import glob
 from pathlib import Path
 import threading
+import multiprocessing
+import queue
 import sys
 
 recognizer = sr.Recognizer()
-tts_engine = None
+tts_supervisor = None
+tts_unavailable = False
 tts_lock = threading.Lock()
 
-def init_tts():
-    """Initialize TTS engine safely"""
-    global tts_engine
+TTS_RATE = 160
+TTS_READY_TIMEOUT = 15
+TTS_BASE_TIMEOUT = 2
+TTS_RATE_SLACK = 1.5
+TTS_PROGRESS_TIMEOUT = 3
+TTS_POLL_INTERVAL = 0.05
+
+def create_tts_engine():
+    """Create and configure a pyttsx3 engine"""
+    engine = pyttsx3.init()
+    engine.setProperty('rate', TTS_RATE)
+    voices = engine.getProperty('voices')
+    if voices:
+        engine.setProperty('voice', voices[0].id)
+    return engine
+
+def speech_timeout(text):
+    """Upper bound on how long speaking text should take at TTS_RATE words per minute"""
+    words = max(len(text.split()), len(text) / 6, 1)
+    return TTS_BASE_TIMEOUT + words * 60 / TTS_RATE * TTS_RATE_SLACK
+
+def tts_worker(requests, replies):
+    """Speak queued text in a separate process until told to stop"""
     try:
-        if tts_engine is None:
-            tts_engine = pyttsx3.init()
-            tts_engine.setProperty('rate', 160)
-            voices = tts_engine.getProperty('voices')
-            if voices:
-                tts_engine.setProperty('voice', voices[0].id)
-        return True
+        engine = create_tts_engine()
     except Exception as e:
+        replies.put(("failed", None, str(e)))
+        return
+    
+    current_request = [None]
+    def report_progress(**kwargs):
+        replies.put(("progress", current_request[0], None))
+    engine.connect('started-utterance', report_progress)
+    engine.connect('started-word', report_progress)
+    replies.put(("ready", None, None))
+    
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        request_id, text = request
+        current_request[0] = request_id
+        try:
+            engine.say(text)
+            engine.runAndWait()
+            replies.put(("done", request_id, None))
+        except Exception as e:
+            replies.put(("failed", request_id, str(e)))
+
+class TTSWorker:
+    """Handle to a single TTS worker process and its queues"""
+    
+    def __init__(self, context):
+        self.requests = context.Queue()
+        self.replies = context.Queue()
+        self.ready = False
+        self.failed = False
+        self.reports_progress = False
+        self.closed = False
+        try:
+            self.process = context.Process(target=tts_worker, args=(self.requests, self.replies), daemon=True)
+            self.process.start()
+        except Exception:
+            self.close_queues()
+            raise
+    
+    def poll_ready(self):
+        """Check without blocking whether the engine is ready to speak"""
+        if self.failed:
+            return False
+        if not self.process.is_alive():
+            self.failed = True
+            return False
+        if self.ready:
+            return True
+        try:
+            status, _, _ = self.replies.get_nowait()
+        except queue.Empty:
+            return False
+        self.ready = status == "ready"
+        self.failed = not self.ready
+        return self.ready
+    
+    def wait_ready(self, timeout):
+        """Wait for the engine to finish initializing, giving up early if it failed"""
+        deadline = time.monotonic() + timeout
+        while not self.poll_ready():
+            if self.failed or time.monotonic() >= deadline:
+                return False
+            time.sleep(TTS_POLL_INTERVAL)
+        return True
+    
+    def say(self, request_id, text, timeout, watch_progress):
+        """Send text to the worker and return its status: done, failed or timeout
+        
+        With watch_progress set, the worker also times out when the driver
+        reports no word progress for TTS_PROGRESS_TIMEOUT seconds.
+        """
+        self.requests.put((request_id, text))
+        deadline = time.monotonic() + timeout
+        last_progress = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now >= deadline or (watch_progress and now - last_progress >= TTS_PROGRESS_TIMEOUT):
+                return "timeout"
+            if not self.process.is_alive():
+                return "failed"
+            try:
+                status, reply_id, _ = self.replies.get(timeout=TTS_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if reply_id != request_id:
+                continue
+            if status == "progress":
+                self.reports_progress = True
+                last_progress = time.monotonic()
+                continue
+            return status
+    
+    def stop(self):
+        """Ask a healthy worker to exit, killing it if it does not respond"""
+        if self.process.is_alive():
+            try:
+                self.requests.put(None)
+            except Exception:
+                pass
+            self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.close_queues()
+    
+    def kill(self):
+        """Kill an unhealthy worker immediately"""
+        self.failed = True
+        if self.closed:
+            return
+        self.process.kill()
+        self.process.join(timeout=TTS_POLL_INTERVAL)
+        self.requests.cancel_join_thread()
+        self.close_queues()
+    
+    def close_queues(self):
+        """Close both queues so their feeder threads exit"""
+        if self.closed:
+            return
+        self.closed = True
+        self.requests.close()
+        self.replies.close()
+
+class TTSSupervisor:
+    """Run speech in a worker process, keeping a pre-warmed standby to swap in on failure"""
+    
+    def __init__(self):
+        self.context = multiprocessing.get_context("spawn")
+        self.active = TTSWorker(self.context)
+        self.standby = None
+        self.spawn_standby()
+        self.reports_progress = False
+        self.next_request_id = 0
+    
+    def spawn_standby(self):
+        """Start a new standby worker, leaving none if the spawn fails"""
+        try:
+            self.standby = TTSWorker(self.context)
+        except Exception as e:
+            self.standby = None
+    
+    def start(self):
+        """Wait for an engine to become ready, falling back to the standby"""
+        deadline = time.monotonic() + TTS_READY_TIMEOUT
+        if self.active.wait_ready(TTS_READY_TIMEOUT):
+            return True
+        self.replace_active()
+        if self.active.failed:
+            return False
+        return self.active.wait_ready(max(0, deadline - time.monotonic()))
+    
+    def replace_active(self):
+        """Kill the active worker and promote the standby, if there is one"""
+        self.active.kill()
+        if self.standby is not None:
+            self.active = self.standby
+            self.standby = None
+        self.spawn_standby()
+    
+    def say(self, text):
+        """Speak text without ever waiting on an engine that is not already warm"""
+        if self.standby is None:
+            self.spawn_standby()
+        if not self.active.poll_ready():
+            if self.active.failed:
+                self.replace_active()
+            return False
+        
+        self.next_request_id += 1
+        status = self.active.say(self.next_request_id, text, speech_timeout(text), self.reports_progress)
+        self.reports_progress = self.reports_progress or self.active.reports_progress
+        if status == "done":
+            return True
+        
+        # Don't retry: the text was already printed, and the same text may break the standby too
+        self.replace_active()
         return False
+    
+    def shutdown(self):
+        """Stop both worker processes"""
+        self.active.stop()
+        if self.standby is not None:
+            self.standby.stop()
+    
+    def kill(self):
+        """Kill both worker processes immediately"""
+        self.active.kill()
+        if self.standby is not None:
+            self.standby.kill()
+
+def init_tts():
+    """Start the TTS worker processes, remembering if TTS is unavailable"""
+    global tts_supervisor, tts_unavailable
+    if tts_supervisor is not None:
+        return True
+    if tts_unavailable:
+        return False
+    supervisor = None
+    try:
+        supervisor = TTSSupervisor()
+        if supervisor.start():
+            tts_supervisor = supervisor
+            return True
+    except Exception as e:
+        pass
+    if supervisor is not None:
+        supervisor.kill()
+    tts_unavailable = True
+    return False
+
+def shutdown_tts():
+    """Stop the TTS worker processes"""
+    global tts_supervisor
+    with tts_lock:
+        if tts_supervisor is not None:
+            tts_supervisor.shutdown()
+            tts_supervisor = None
 
 def speak(text):
     """Simple speak function"""
     print(f"[Bot]: {text}")
     
     with tts_lock:
-        try:
-            if not init_tts():
-                return
-            
-            tts_engine.say(text)
-            tts_engine.runAndWait()
+        if not init_tts():
+            return
+        
+        if tts_supervisor.say(text):
             time.sleep(0.3)
-            
-        except Exception as e:
-            try:
-                tts_engine = pyttsx3.init()
-                tts_engine.setProperty('rate', 160)
-                voices = tts_engine.getProperty('voices')
-                if voices:
-                    tts_engine.setProperty('voice', voices[0].id)
-                
-                tts_engine.say(text)
-                tts_engine.runAndWait()
-                
-            except Exception as e2:
-                pass
 
 def listen(timeout=8):
     """Listen function with error handling"""
@@ -632,42 +850,45 @@ def fill_card_number_field(page, field):
             speak("Let's try again.")
 
 def run_voice_filler():
-    if not init_tts():
-        return
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
-        
-        speak("Please provide the form URL")
-        form_url = input("Enter the form URL: ")
-        
-        page.goto(form_url)
-        time.sleep(3)
-        
-        speak("Analyzing form fields...")
-        fields = analyze_form_fields(page)
-        
-        if not fields:
-            speak("No form fields found on this page.")
-            browser.close()
+    try:
+        if not init_tts():
             return
         
-        speak(f"Found {len(fields)} form fields. Starting voice form filling.")
-        
-        for i, field in enumerate(fields, 1):
-            speak(f"Processing field {i} of {len(fields)}: {field['label']}")
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=False)
+            page = browser.new_page()
             
-            try:
-                fill_field_by_purpose(page, field)
-            except Exception as e:
-                speak(f"Error processing {field['label']}, skipping to next field")
+            speak("Please provide the form URL")
+            form_url = input("Enter the form URL: ")
             
-            time.sleep(1)
+            page.goto(form_url)
+            time.sleep(3)
+            
+            speak("Analyzing form fields...")
+            fields = analyze_form_fields(page)
+            
+            if not fields:
+                speak("No form fields found on this page.")
+                browser.close()
+                return
+            
+            speak(f"Found {len(fields)} form fields. Starting voice form filling.")
+            
+            for i, field in enumerate(fields, 1):
+                speak(f"Processing field {i} of {len(fields)}: {field['label']}")
+                
+                try:
+                    fill_field_by_purpose(page, field)
+                except Exception as e:
+                    speak(f"Error processing {field['label']}, skipping to next field")
+                
+                time.sleep(1)
 
-        speak("Form filling completed.")
-        input("Press Enter to close browser...")
-        browser.close()
+            speak("Form filling completed.")
+            input("Press Enter to close browser...")
+            browser.close()
+    finally:
+        shutdown_tts()
 
 if __name__ == "__main__":
     run_voice_filler()